@@ -12,7 +12,7 @@ both IPv4 (A) and IPv6 (AAAA) records based on the CloudFront distribution confi
 Enhancements include:
 - IPv6 support with automatic A and AAAA record handling
 - Domain validation against actual CloudFront distribution
-- API rate limiting protection with jitter
+- API rate limiting protection with decorrelated jitter backoff
 - Comprehensive input validation and error handling
 - UPSERT operations for safer DNS updates
 
@@ -27,21 +27,48 @@ Example:
 """
 
 import boto3
-import json
+import logging
+import os
 import sys
 import time
 import random
+from functools import lru_cache
+from botocore.config import Config
 
-session = boto3.Session()
-r53 = session.client('route53')
-cf = session.client('cloudfront')
-sts = session.client('sts')  # to assume a role if needed
+log = logging.getLogger(__name__)
+
+# Route 53 change batches are kept at or below this many changes per request
+MAX_CHANGES_PER_BATCH = 100
+
+# Adaptive retry mode rate-limits retries client-side, which keeps the script
+# within the Route 53 and CloudFront API quotas when several copies run at once.
+# botocore already reuses pooled HTTP keep-alive connections between polls.
+config = Config(
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    connect_timeout=3,
+    read_timeout=10
+)
+
+
+# Clients are created on first use and then reused, so importing this module
+# (e.g. from the Lambda handler) doesn't pay for boto3 client setup.
+@lru_cache(maxsize=None)
+def get_r53_client():
+    return boto3.client('route53', config=config)
+
+
+@lru_cache(maxsize=None)
+def get_cf_client():
+    return boto3.client('cloudfront', config=config)
 
 
 def validate_inputs(cloudfront_id, hosted_zone_id, new_domain, alias):
     """
     Validate all input parameters before processing.
 
+    Parameters come from sys.argv, so they are always strings and only need
+    to be checked for being blank.
+
     Args:
         cloudfront_id (str): CloudFront distribution ID
         hosted_zone_id (str): Route 53 hosted zone ID
@@ -54,22 +81,22 @@ def validate_inputs(cloudfront_id, hosted_zone_id, new_domain, alias):
     errors = []
 
     # Check if CloudFront distribution ID exists and is non-empty
-    if not cloudfront_id or not isinstance(cloudfront_id, str) or not cloudfront_id.strip():
+    if not cloudfront_id.strip():
         errors.append(
             "CloudFront distribution ID is required and must be a non-empty string")
 
     # Check if Route 53 hosted zone ID exists and is non-empty
-    if not hosted_zone_id or not isinstance(hosted_zone_id, str) or not hosted_zone_id.strip():
+    if not hosted_zone_id.strip():
         errors.append(
             "Route 53 hosted zone ID is required and must be a non-empty string")
 
     # Check if new domain exists and is non-empty
-    if not new_domain or not isinstance(new_domain, str) or not new_domain.strip():
+    if not new_domain.strip():
         errors.append(
             "New CloudFront domain is required and must be a non-empty string")
 
     # Check if alias exists and is non-empty
-    if not alias or not isinstance(alias, str) or not alias.strip():
+    if not alias.strip():
         errors.append("DNS alias is required and must be a non-empty string")
 
     if errors:
@@ -80,66 +107,90 @@ def validate_inputs(cloudfront_id, hosted_zone_id, new_domain, alias):
     return True
 
 
-def checkAlias(cloudfrontID, alias, expected_domain):
-    response = cf.get_distribution(Id=cloudfrontID)
-
-    # Validate that the expected domain matches the actual CloudFront domain
+def validate_domain(response, expected_domain):
+    # Validate that the expected domain matches the actual CloudFront domain.
+    # Names may or may not carry a trailing dot, so compare them without it.
     actual_domain = response["Distribution"]["DomainName"]
-    print(f"CloudFront distribution domain: {actual_domain}")
+    log.info("CloudFront distribution domain: %s", actual_domain)
 
     if expected_domain.rstrip('.') != actual_domain.rstrip('.'):
         raise ValueError(
             f"Domain mismatch: Expected '{expected_domain}' but distribution has '{actual_domain}'")
 
-    # Safely get aliases with proper error handling
-    try:
-        aliases = response["Distribution"]["DistributionConfig"]["Aliases"]["Items"]
-    except KeyError:
-        aliases = []
-
-    # Handle case where aliases can be empty or None
-    if aliases:
-        print(f"Current aliases: {aliases}")
-    else:
-        print("No aliases currently configured")
-
-    while not aliases or alias not in aliases:
-        # Add jitter and delay -- too much of delay will result in a delayed DNS update. 
-        base_delay = 3  # Base delay of 3 seconds
-        jitter = random.uniform(0, 5)  # Random jitter between 0-5 seconds
-        total_delay = base_delay + jitter
-
-        print(f"Waiting {total_delay:.1f} seconds before next check...")
-        time.sleep(total_delay)
-
-        response = cf.get_distribution(Id=cloudfrontID)
-
-        # Safely get aliases in the loop as well
-        try:
-            aliases = response["Distribution"]["DistributionConfig"]["Aliases"]["Items"]
-        except KeyError:
-            aliases = []
-
-        if not aliases:
-            print("Waiting for aliases to be configured...")
-        elif alias not in aliases:
-            print(
-                f"Waiting for alias '{alias}' to be added. Current aliases: {aliases}")
+
+def get_aliases(distribution_config):
+    # Safely get aliases -- Items is missing when no aliases are configured.
+    # Trailing dots are stripped so they compare equal to a normalized alias.
+    return frozenset(a.rstrip('.') for a in
+                     distribution_config.get("Aliases", {}).get("Items") or [])
+
+
+def checkAlias(cloudfrontID, alias, expected_domain):
+    # Normalize the alias once up front rather than on every poll
+    alias_norm = alias.rstrip('.')
+
+    response = get_cf_client().get_distribution(Id=cloudfrontID)
+    validate_domain(response, expected_domain)
+
+    # Keep the config and its ETag so polls can skip unchanged configs
+    distribution_config = response["Distribution"]["DistributionConfig"]
+    etag = response["ETag"]
+
+    # Decorrelated jitter backoff -- delays spread out across concurrent runs and
+    # grow after each miss, capped so the DNS update is never delayed too long.
+    base_delay = 3  # Base delay of 3 seconds
+    max_delay = 30  # Upper bound on any single delay
+    total_delay = base_delay
+
+    while True:
+        aliases = get_aliases(distribution_config)
+        if alias_norm in aliases:
+            break
+
+        if aliases:
+            # Guarded so the aliases aren't sorted when INFO logging is off
+            if log.isEnabledFor(logging.INFO):
+                log.info("Waiting for alias '%s' to be added. Current aliases: %s",
+                         alias, sorted(aliases))
+        else:
+            log.info("Waiting for aliases to be configured...")
+
+        # The ETag changes whenever the config does, so keep polling until it does
+        previous_etag = etag
+        while etag == previous_etag:
+            total_delay = min(max_delay, random.uniform(base_delay, total_delay * 3))
+
+            log.debug("Waiting %d ms before next check...", int(total_delay * 1000))
+            time.sleep(total_delay)
+
+            # Only the config is needed here, which is a smaller response
+            response = get_cf_client().get_distribution_config(Id=cloudfrontID)
+            etag = response["ETag"]
+
+        distribution_config = response["DistributionConfig"]
 
     # Check IPv6 status
-    ipv6_enabled = response["Distribution"]["DistributionConfig"].get(
-        "IsIPV6Enabled", False)
-    print(f"IPv6 enabled: {ipv6_enabled}")
+    ipv6_enabled = distribution_config.get("IsIPV6Enabled", False)
+    log.info("IPv6 enabled: %s", ipv6_enabled)
 
     return ipv6_enabled
 
 
-def updateRecord(hostedzoneID, new_domain, alias, ipv6_enabled=False):
+def updateRecord(hostedzoneID, updates):
+    """
+    Point one or more aliases in a hosted zone at their CloudFront domains.
+
+    Args:
+        hostedzoneID (str): Route 53 hosted zone ID
+        updates (list): (alias, new_domain, ipv6_enabled) tuples; an AAAA
+            record is added alongside the A record when ipv6_enabled is True
+    """
     # To assume a role to update a record or all an API in another account, please follow our guides here:
     # https://docs.aws.amazon.com/IAM/latest/UserGuide/id_roles_use_switch-role-api.html
 
     # For example, please see the below sample process to assume a role to make a call in Route 53
     # 1. assume role
+    # sts = boto3.client('sts')
     # sts_response = sts.assume_role(RoleArn="role-ARN-here", RoleSessionName="session-name-here")
     # temp_credentials = sts_response["Credentials"]
 
@@ -150,49 +201,63 @@ def updateRecord(hostedzoneID, new_domain, alias, ipv6_enabled=False):
     #    aws_secret_access_key=temp_credentials["SecretAccessKey"],
     #    aws_session_token=temp_credentials["SessionToken"],
     # )
-    # 3. Call the below call w/ new r53 resource, for ex: use r53_resource.change_resource_record_sets, instead of the below r53.change_resource_record_sets
-
-    changes = [
-        {
-            'Action': 'UPSERT',
-            'ResourceRecordSet': {
-                'Name': alias,
-                'Type': 'A',
-                'AliasTarget': {
-                    'HostedZoneId': 'Z2FDTNDATAQYW2',
-                    'DNSName': new_domain,
-                    'EvaluateTargetHealth': False
-                }
-            }
+    # 3. Call the below call w/ new r53 resource, for ex: use r53_resource.change_resource_record_sets, instead of the below get_r53_client().change_resource_record_sets
+
+    # Group the changes into as few requests as possible. Each batch is applied
+    # transactionally by Route 53 but separate batches are not, so an alias's
+    # A and AAAA records always go in the same batch.
+    batches = [[]]
+    for alias, new_domain, ipv6_enabled in updates:
+        record_types = ['A', 'AAAA'] if ipv6_enabled else ['A']
+        if ipv6_enabled:
+            log.info("Adding IPv6 (AAAA) records for %s...", alias)
+
+        # A and AAAA records share the same alias target
+        alias_target = {
+            'HostedZoneId': 'Z2FDTNDATAQYW2',
+            'DNSName': new_domain,
+            'EvaluateTargetHealth': False
         }
-    ]
-
-    # Add IPv6 records if enabled
-    if ipv6_enabled:
-        print("Adding IPv6 (AAAA) records...")
-        changes.append({
-            'Action': 'UPSERT',
-            'ResourceRecordSet': {
-                'Name': alias,
-                'Type': 'AAAA',
-                'AliasTarget': {
-                    'HostedZoneId': 'Z2FDTNDATAQYW2',
-                    'DNSName': new_domain,
-                    'EvaluateTargetHealth': False
+        alias_changes = [
+            {
+                'Action': 'UPSERT',
+                'ResourceRecordSet': {
+                    'Name': alias,
+                    'Type': record_type,
+                    'AliasTarget': alias_target
                 }
             }
-        })
-
-    response = r53.change_resource_record_sets(
-        HostedZoneId=hostedzoneID,
-        ChangeBatch={
-            'Comment': 'CloudFront CNAME swap with IPv4 and IPv6 support',
-            'Changes': changes
-        }
-    )
+            for record_type in record_types
+        ]
+
+        if len(batches[-1]) + len(alias_changes) > MAX_CHANGES_PER_BATCH:
+            batches.append([])
+        batches[-1].extend(alias_changes)
+
+    for changes in batches:
+        if not changes:
+            continue
+        get_r53_client().change_resource_record_sets(
+            HostedZoneId=hostedzoneID,
+            ChangeBatch={
+                'Comment': 'CloudFront CNAME swap with IPv4 and IPv6 support',
+                'Changes': changes
+            }
+        )
 
 
 def main():
+    # Set LOG_LEVEL=DEBUG to see every poll, or WARNING to only see problems.
+    # Unknown values fall back to INFO.
+    level_name = (os.environ.get('LOG_LEVEL') or 'INFO').upper()
+    level = logging.getLevelName(level_name)
+    logging.basicConfig(
+        level=level if isinstance(level, int) else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s"
+    )
+    if not isinstance(level, int):
+        log.warning("Unknown LOG_LEVEL '%s', using INFO", level_name)
+
     # Check if correct number of arguments provided
     if len(sys.argv) != 5:
         print("Error: Incorrect number of arguments provided.")
@@ -215,30 +280,29 @@ def main():
         # Validate all input parameters
         validate_inputs(cloudfrontID, hostedzoneID, new_domain, alias)
 
-        print("All required parameters exist. Starting CloudFront monitoring...")
-        print(f"Monitoring distribution: {cloudfrontID}")
-        print(
-            f"Validating domain and waiting for alias '{alias}' to be available...")
+        log.info("All required parameters exist. Starting CloudFront monitoring...")
+        log.info("Monitoring distribution: %s", cloudfrontID)
+        log.info("Validating domain and waiting for alias '%s' to be available...", alias)
 
         ipv6_enabled = checkAlias(cloudfrontID, alias, new_domain)
 
         if ipv6_enabled:
-            print("Alias found! Updating DNS records (IPv4 and IPv6)...")
+            log.info("Alias found! Updating DNS records (IPv4 and IPv6)...")
         else:
-            print("Alias found! Updating DNS record (IPv4 only)...")
+            log.info("Alias found! Updating DNS record (IPv4 only)...")
 
-        updateRecord(hostedzoneID, new_domain, alias, ipv6_enabled)
+        updateRecord(hostedzoneID, [(alias, new_domain, ipv6_enabled)])
 
         if ipv6_enabled:
-            print("DNS records updated! (A and AAAA records)")
+            log.info("DNS records updated! (A and AAAA records)")
         else:
-            print("DNS record updated! (A record only)")
+            log.info("DNS record updated! (A record only)")
 
     except ValueError as e:
-        print(f"Validation Error: {e}")
+        log.error("Validation Error: %s", e)
         sys.exit(1)
     except Exception as e:
-        print(f"Error: {e}")
+        log.error("Error: %s", e)
         sys.exit(1)
 
 
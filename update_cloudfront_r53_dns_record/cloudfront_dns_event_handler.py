@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+CloudFront CNAME Swap DNS Automation - Event-Driven Lambda Handler
+
+Event-driven alternative to polling in cloudfront_dns_automation.py. An
+EventBridge rule forwards CloudTrail UpdateDistribution and AssociateAlias
+events for the watched CloudFront distribution to this function, which checks
+the distribution once and updates the Route 53 record as soon as the alias
+shows up. AssociateAlias covers self-service alias moves.
+
+Alias moves performed by AWS Support are NOT made through these API calls in
+your account, so they never trigger this function. Use the polling script
+(cloudfront_dns_automation.py) for Support-performed moves.
+
+Configuration (Lambda environment variables):
+    DISTRIBUTION_ID     CloudFront distribution ID to watch
+    HOSTED_ZONE_ID      Route 53 hosted zone ID containing the DNS record
+    CLOUDFRONT_DOMAIN   CloudFront domain name of the distribution
+    ALIAS               DNS alias (alternate domain name) to update
+
+CloudFront is a global service, so its CloudTrail events (and the EventBridge
+rule) live in us-east-1.
+"""
+
+import logging
+import os
+
+from cloudfront_dns_automation import (
+    get_aliases, get_cf_client, updateRecord, validate_domain)
+
+log = logging.getLogger(__name__)
+
+# Lambda installs a handler on the root logger; let INFO messages through it
+logging.getLogger().setLevel(logging.INFO)
+
+
+def lambda_handler(event, context):
+    cloudfrontID = os.environ['DISTRIBUTION_ID']
+    hostedzoneID = os.environ['HOSTED_ZONE_ID']
+    new_domain = os.environ['CLOUDFRONT_DOMAIN']
+    alias = os.environ['ALIAS']
+
+    # The EventBridge rule only matches events for DISTRIBUTION_ID, so the
+    # distribution just needs to be checked once for the alias
+    response = get_cf_client().get_distribution(Id=cloudfrontID)
+    validate_domain(response, new_domain)
+
+    distribution_config = response["Distribution"]["DistributionConfig"]
+    aliases = get_aliases(distribution_config)
+
+    if alias.rstrip('.') not in aliases:
+        log.info("Alias '%s' not yet on distribution %s. Current aliases: %s",
+                 alias, cloudfrontID, sorted(aliases))
+        return 'Alias not found'
+
+    ipv6_enabled = distribution_config.get("IsIPV6Enabled", False)
+    log.info("Alias '%s' found on distribution %s, updating DNS (IPv6 enabled: %s)",
+             alias, cloudfrontID, ipv6_enabled)
+
+    updateRecord(hostedzoneID, [(alias, new_domain, ipv6_enabled)])
+
+    return 'DNS record updated'
+